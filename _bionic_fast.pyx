@@ -0,0 +1,71 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Optional compiled fast paths for the bionic MyActuator motor protocol.
+   Mirrors bionic_commands.set_position_control and the type 1 field
+   extraction in bionic_responses; both modules fall back to their pure
+   Python versions when this extension is not built.
+
+   Build in place with: cythonize -i _bionic_fast.pyx"""
+
+from libc.math cimport isinf
+from libc.stdint cimport int64_t, uint32_t, uint64_t
+from libc.string cimport memcpy
+
+
+cdef inline uint64_t _truncate(double value, uint64_t mask) except? 0:
+    # Same as int(value) & mask, staying in C when the value fits an int64.
+    if -9.2e18 < value < 9.2e18:
+        return <uint64_t>(<int64_t>value) & mask
+    return int(value) & mask
+
+
+cdef inline uint32_t _fp32_bits(double value) except? 0:
+    cdef float data = <float>value
+    cdef uint32_t bits
+    if isinf(data) and not isinf(value):
+        raise OverflowError("float too large to pack with f format")
+    memcpy(&bits, &data, 4)
+    return bits
+
+
+cpdef bytes set_position_control(
+    double position,
+    motor_mode=1,
+    double max_speed=60.0,
+    double max_current=5.0,
+    message_return=0,
+):
+    """Compiled bionic_commands.set_position_control, see its docstring."""
+    cdef unsigned char buf[8]
+    # The integer fields are masked as Python objects, in the same order as the
+    # Python version, so oversized ints wrap and non-ints raise TypeError.
+    cdef uint64_t mode = motor_mode & 0x7
+    cdef uint64_t bits = _fp32_bits(position)
+    cdef uint64_t speed = _truncate(max_speed * 10, 0x7FFF)
+    cdef uint64_t current = _truncate(max_current * 10, 0xFFF)
+    cdef uint64_t footer = message_return & 0x3
+    cdef uint64_t command = mode << 61 | bits << 29 | speed << 14 | current << 2 | footer
+    cdef int i
+    for i in range(8):
+        buf[i] = (command >> (56 - 8 * i)) & 0xFF
+    return (<char*>buf)[:8]
+
+
+cpdef tuple position_speed_fields(const unsigned char[:] msg):
+    """Splits a type 1 response into its raw fields.
+
+    Args:
+        msg: bytes: The message to interpret
+
+    Returns:
+        (error, position, speed, current, temperature, MOS temperature) as unscaled ints
+    """
+    if msg.shape[0] < 8:
+        raise IndexError("index out of range")
+    return (
+        msg[0] & 0x1F,
+        msg[1] << 8 | msg[2],
+        msg[3] << 4 | msg[4] >> 4,
+        (msg[4] & 0xF) << 8 | msg[5],
+        msg[6],
+        msg[7],
+    )
@@ -0,0 +1,141 @@
+"""Defines batched firmware commands for the bionic MyActuator motors.
+   Generates many CAN Message BODIES (not including the CAN ID) at once,
+   one row of the returned uint8 array per command.
+
+   Requires numpy. The packing loop is JIT-compiled with numba when it is
+   installed and falls back to vectorized numpy otherwise."""
+
+from typing import Optional, Union
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+#######################################
+# Packing kernels
+#######################################
+
+
+def _pack_position_control_numpy(
+    position_bits: np.ndarray,
+    speeds: np.ndarray,
+    currents: np.ndarray,
+    motor_mode: int,
+    message_return: int,
+    out: np.ndarray,
+) -> None:
+    # Same layout as set_position_control, split on byte boundaries:
+    # 3-bit mode | fp32 position | 15-bit speed | 12-bit current | 2-bit return
+    out[:, 0] = (motor_mode & 0x7) << 5 | position_bits >> 27
+    out[:, 1] = (position_bits >> 19) & 0xFF
+    out[:, 2] = (position_bits >> 11) & 0xFF
+    out[:, 3] = (position_bits >> 3) & 0xFF
+    out[:, 4] = (position_bits & 0x7) << 5 | speeds >> 10
+    out[:, 5] = (speeds >> 2) & 0xFF
+    out[:, 6] = (speeds & 0x3) << 6 | currents >> 6
+    out[:, 7] = (currents & 0x3F) << 2 | message_return & 0x3
+
+
+def _pack_position_control_loop(
+    position_bits: np.ndarray,
+    speeds: np.ndarray,
+    currents: np.ndarray,
+    motor_mode: int,
+    message_return: int,
+    out: np.ndarray,
+) -> None:
+    header = (motor_mode & 0x7) << 5
+    footer = message_return & 0x3
+    for i in range(position_bits.shape[0]):
+        bits = position_bits[i]
+        speed = speeds[i]
+        current = currents[i]
+        out[i, 0] = header | bits >> 27
+        out[i, 1] = (bits >> 19) & 0xFF
+        out[i, 2] = (bits >> 11) & 0xFF
+        out[i, 3] = (bits >> 3) & 0xFF
+        out[i, 4] = (bits & 0x7) << 5 | speed >> 10
+        out[i, 5] = (speed >> 2) & 0xFF
+        out[i, 6] = (speed & 0x3) << 6 | current >> 6
+        out[i, 7] = (current & 0x3F) << 2 | footer
+
+
+if njit is not None:
+    _pack_position_control = njit(cache=True, boundscheck=False)(_pack_position_control_loop)
+else:
+    _pack_position_control = _pack_position_control_numpy
+
+
+def _truncate(values: Union[float, np.ndarray], shape: tuple, num_bits: int) -> np.ndarray:
+    # Same as int(value * 10) & mask in the scalar builders, including their errors.
+    with np.errstate(over="ignore"):
+        scaled = np.broadcast_to(np.asarray(values, dtype=np.float64) * 10, shape)
+    if np.isnan(scaled).any():
+        raise ValueError("cannot convert float NaN to integer")
+    if np.isinf(scaled).any():
+        raise OverflowError("cannot convert float infinity to integer")
+    modulus = float(1 << num_bits)
+    wrapped = np.fmod(np.trunc(scaled), modulus)
+    wrapped[wrapped < 0] += modulus
+    return wrapped.astype(np.int64)
+
+
+#######################################
+# Movement commands
+#######################################
+
+
+def pack_position_control_batch(
+    positions: np.ndarray,
+    max_speeds: Union[float, np.ndarray] = 60.0,
+    max_currents: Union[float, np.ndarray] = 5.0,
+    motor_mode: int = 1,
+    message_return: int = 0,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Gets the commands to set the positions of many motors. Expect (N, 8) bytes.
+        Row i matches set_position_control(positions[i], motor_mode,
+        max_speeds[i], max_currents[i], message_return), and invalid input
+        raises the same errors: ValueError for NaN speeds or currents,
+        OverflowError for infinite ones or for positions beyond float32.
+        NOTE: you need to specify the motor id as the CAN identifier
+        since it's not used in the message body
+
+    Args:
+        positions: The positions to set the motors to, shape (N,).
+        max_speeds: The maximum speeds of the motors, in rotations per minute.
+                    Either shape (N,) or a scalar shared by every motor.
+        max_currents: The maximum currents of the motors, in amps.
+                      Either shape (N,) or a scalar shared by every motor.
+        motor_mode: 0x1 for servo position control.
+        message_return: The message return status.
+        out: Optional preallocated uint8 array of shape (N, 8) to write into.
+
+    Returns:
+        The (N, 8) uint8 array of commands, one row per motor.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if positions.ndim != 1:
+        raise ValueError(f"Expected positions of shape (N,), got {positions.shape}")
+    with np.errstate(over="ignore"):
+        positions_fp32 = positions.astype(np.float32)
+    if (np.isinf(positions_fp32) & np.isfinite(positions)).any():
+        raise OverflowError("float too large to pack with f format")
+    position_bits = positions_fp32.view(np.uint32).astype(np.int64)
+    speeds = _truncate(max_speeds, positions.shape, 15)
+    currents = _truncate(max_currents, positions.shape, 12)
+
+    if out is None:
+        out = np.empty((positions.shape[0], 8), dtype=np.uint8)
+    elif out.shape != (positions.shape[0], 8) or out.dtype != np.uint8:
+        raise ValueError(f"Expected a uint8 output of shape {(positions.shape[0], 8)}, got {out.dtype} {out.shape}")
+
+    _pack_position_control(position_bits, speeds, currents, motor_mode, message_return, out)
+    return out
+
+
+if __name__ == "__main__":
+    print(pack_position_control_batch([0.0, 1.5, -3.0]))
@@ -9,6 +9,15 @@ from typing import List, Literal
 # Bitwise helpers
 #######################################
 
+# Standard-size big-endian floats, also used by _SPEED_CONTROL. Unlike the native "f"
+# format, finite values outside the float32 range raise OverflowError instead of
+# being sent as +-inf.
+_FP32 = struct.Struct(">f")
+
+
+def _fp32_bits(data: float) -> int:
+    return int.from_bytes(_FP32.pack(data), "big")
+
 
 def push_bits(value: int, data: int, num_bits: int) -> int:
     value <<= num_bits
@@ -17,19 +26,34 @@ def push_bits(value: int, data: int, num_bits: int) -> int:
 
 
 def push_fp32_bits(value: int, data: float) -> int:
-    data_bits = struct.unpack("I", struct.pack("f", data))[0]
-    value = push_bits(value, data_bits, 32)
-    return value
+    return value << 32 | _fp32_bits(data)
 
 
 def split_into_bytes(command: int, length: int = 8, little_endian: bool = True) -> List[int]:
-    bytes_list = []
-    for i in range(length):
-        bytes_list.append(command & 0xFF)
-        command = command >> 8
-    if little_endian:
-        bytes_list = bytes_list[::-1]
-    return bytes_list
+    command &= (1 << (8 * length)) - 1
+    return list(command.to_bytes(length, "big" if little_endian else "little"))
+
+
+#######################################
+# Packed layouts
+#######################################
+
+# 3-bit mode | fp32 position | 15-bit speed | 12-bit current | 2-bit return
+_POSITION_CONTROL = struct.Struct(">Q")
+# 3-bit mode | 3-bit reserved | 2-bit return | fp32 speed | 16-bit current
+_SPEED_CONTROL = struct.Struct(">BfH")
+# 3-bit mode | 3-bit status | 2-bit return | 16-bit value
+_CURRENT_TORQUE_CONTROL = struct.Struct(">BH")
+# 16-bit motor id | 0x00 | 0x03
+_ZERO_POSITION = struct.Struct(">HBB")
+# 3-bit reserved | 12-bit kp | 9-bit kd | 16-bit position | 12-bit speed | 12-bit torque
+_HYBRID_CONTROL = struct.Struct(">Q")
+
+# 3-bit 0x7 | 5-bit reserved | 8-bit query code
+_GET_MOTOR_POS = bytes((0xE0, 0x01))
+_GET_MOTOR_SPEED = bytes((0xE0, 0x02))
+_GET_MOTOR_CURRENT = bytes((0xE0, 0x03))
+_GET_MOTOR_POWER = bytes((0xE0, 0x04))
 
 
 #######################################
@@ -43,7 +67,7 @@ def set_position_control(
     max_speed: float = 60.0,
     max_current: float = 5.0,
     message_return: Literal[0, 1, 2, 3] = 0,
-) -> List[int]:
+) -> bytes:
     """Gets the command to set the position of a motor. Expect 8 bytes.
         NOTE: you need to specify the motor id as the CAN identifier 
         since it's not used in the message body
@@ -58,13 +82,14 @@ def set_position_control(
     Returns:
         The command to set the position of a motor.
     """
-    command = 0
-    command = push_bits(command, motor_mode, 3)
-    command = push_fp32_bits(command, position)
-    command = push_bits(command, int(max_speed * 10), 15)
-    command = push_bits(command, int(max_current * 10), 12)
-    command = push_bits(command, message_return, 2)
-    return split_into_bytes(command)
+    command = (
+        (motor_mode & 0x7) << 61
+        | _fp32_bits(position) << 29
+        | (int(max_speed * 10) & 0x7FFF) << 14
+        | (int(max_current * 10) & 0xFFF) << 2
+        | message_return & 0x3
+    )
+    return _POSITION_CONTROL.pack(command)
 
 
 def set_speed_control(
@@ -72,7 +97,7 @@ def set_speed_control(
     motor_mode: int = 2,
     current: float = 5.0,
     message_return: Literal[0, 1, 2, 3] = 0,
-) -> List[int]:
+) -> bytes:
     """Gets the command to set the speed of a motor. Expect 7 bytes.
         NOTE: you need to specify the motor id as the CAN identifier 
         since it's not used in the message body
@@ -86,13 +111,8 @@ def set_speed_control(
     Returns:
         The command to set the speed of a motor.
     """
-    command = 0
-    command = push_bits(command, motor_mode, 3)
-    command = push_bits(command, 0, 3)
-    command = push_bits(command, message_return, 2)
-    command = push_fp32_bits(command, speed)
-    command = push_bits(command, int(current * 10), 16)
-    return split_into_bytes(command, 7)
+    header = (motor_mode & 0x7) << 5 | message_return & 0x3
+    return _SPEED_CONTROL.pack(header, speed, int(current * 10) & 0xFFFF)
 
 
 def set_current_torque_control(
@@ -100,7 +120,7 @@ def set_current_torque_control(
     control_status: Literal[0, 1, 2, 3, 4, 5, 6, 7] = 0,
     motor_mode: int = 3,
     message_return: Literal[0, 1, 2, 3] = 0,
-) -> List[int]:
+) -> bytes:
     """Gets the command to set the current OR torque of a motor. Expect 3 bytes.
         NOTE: you need to specify the motor id as the CAN identifier 
         since it's not used in the message body
@@ -115,16 +135,12 @@ def set_current_torque_control(
     Returns:
         The command to set the current of a motor.
     """
-    command = 0
-    command = push_bits(command, motor_mode, 3)
-    command = push_bits(command, control_status, 3)
-    command = push_bits(command, message_return, 2)
+    header = (motor_mode & 0x7) << 5 | (control_status & 0x7) << 2 | message_return & 0x3
     # TODO, needs testing for int16
-    command = push_bits(command, (int)(value * 10), 16)
-    return split_into_bytes(command, 3)
+    return _CURRENT_TORQUE_CONTROL.pack(header, int(value * 10) & 0xFFFF)
 
 
-def set_zero_position(motor_id: int) -> List[int]:
+def set_zero_position(motor_id: int) -> bytes:
     """Gets the command to set the zero position of a motor. Expect 4 bytes.
         NOTE: Motor ID is packed into the body. Use 0x7FF
 
@@ -134,14 +150,7 @@ def set_zero_position(motor_id: int) -> List[int]:
     Returns:
         The command to set the zero position of a motor.
     """
-    upper = motor_id >> 8
-    lower = motor_id & 0xFF
-    command = 0
-    command = push_bits(command, upper, 8)
-    command = push_bits(command, lower, 8)
-    command = push_bits(command, 0, 8)
-    command = push_bits(command, 3, 8)
-    return split_into_bytes(command, 4)
+    return _ZERO_POSITION.pack(motor_id & 0xFFFF, 0, 3)
 
 
 #######################################
@@ -149,7 +158,7 @@ def set_zero_position(motor_id: int) -> List[int]:
 #######################################
 
 
-def get_motor_pos() -> List[int]:
+def get_motor_pos() -> bytes:
     """Gets the motor Position of a respective motor.
         NOTE: you need to specify the motor id as the CAN identifier 
         since it's not used in the message body
@@ -157,14 +166,10 @@ def get_motor_pos() -> List[int]:
     Returns:
         The respective motor position
     """
-    command = 0
-    command = push_bits(command, 0x7, 3)
-    command = push_bits(command, 0x0, 5)
-    command = push_bits(command, 0x1, 8)
-    return split_into_bytes(command, 2)
+    return _GET_MOTOR_POS
 
 
-def get_motor_speed() -> List[int]:
+def get_motor_speed() -> bytes:
     """Gets the motor Position of a respective motor.
         NOTE: you need to specify the motor id as the CAN identifier 
         since it's not used in the message body
@@ -172,14 +177,10 @@ def get_motor_speed() -> List[int]:
     Returns:
         The respective motor speed.
     """
-    command = 0
-    command = push_bits(command, 0x7, 3)
-    command = push_bits(command, 0x0, 5)
-    command = push_bits(command, 0x2, 8)
-    return split_into_bytes(command, 2)
+    return _GET_MOTOR_SPEED
 
 
-def get_motor_current() -> List[int]:
+def get_motor_current() -> bytes:
     """Gets the motor Position of a respective motor.
         NOTE: you need to specify the motor id as the CAN identifier 
         since it's not used in the message body
@@ -187,14 +188,10 @@ def get_motor_current() -> List[int]:
     Returns:
         The respective motor current draw
     """
-    command = 0
-    command = push_bits(command, 0x7, 3)
-    command = push_bits(command, 0x0, 5)
-    command = push_bits(command, 0x3, 8)
-    return split_into_bytes(command, 2)
+    return _GET_MOTOR_CURRENT
 
 
-def get_motor_power() -> List[int]:
+def get_motor_power() -> bytes:
     """Gets power consumption of a respective motor.
         NOTE: you need to specify the motor id as the CAN identifier 
         since it's not used in the message body
@@ -202,19 +199,32 @@ def get_motor_power() -> List[int]:
     Returns:
         The respective motor power consumption
     """
-    command = 0
-    command = push_bits(command, 0x7, 3)
-    command = push_bits(command, 0x0, 5)
-    command = push_bits(command, 0x4, 8)
-    return split_into_bytes(command, 2)
+    return _GET_MOTOR_POWER
 
 
 #######################################
 # Motor feedback control commands
 #######################################
 
+_DEG_TO_RAD = math.pi / 180.0
 
-def force_position_hybrid_control(kp: float, kd: float, position: float, speed: float, torque_ff: int) -> List[int]:
+
+def _deg_to_int(degrees: float) -> int:
+    value = int(((degrees * _DEG_TO_RAD + 12.5) / 25.0) * 65536)
+    return value if 0 <= value <= 65536 else (0 if value < 0 else 65536)
+
+
+def _rpm_to_int(rpm: float) -> int:
+    value = int(((rpm + 18.0) / 36.0) * 4095)
+    return value if 0 <= value <= 4095 else (0 if value < 0 else 4095)
+
+
+def _torque_to_int(torque: float) -> int:
+    value = int(((torque + 150) / 300) * 4095)
+    return value if 0 <= value <= 4095 else (0 if value < 0 else 4095)
+
+
+def force_position_hybrid_control(kp: float, kd: float, position: float, speed: float, torque_ff: int) -> bytes:
     """Gets the command to set the position of a motor using PD control. Expect 8 bytes.
         NOTE: you need to specify the motor id as the CAN identifier 
         since it's not used in the message body
@@ -229,28 +239,28 @@ def force_position_hybrid_control(kp: float, kd: float, position: float, speed:
     Returns:
         The command to set the position of a motor using PD control.
     """
+    command = (
+        (int(kp * 4095 / 500) & 0xFFF) << 49
+        | (int(kd * 511 / 5) & 0x1FF) << 40
+        | (_deg_to_int(position) & 0xFFFF) << 24
+        | (_rpm_to_int(speed) & 0xFFF) << 12
+        | _torque_to_int(torque_ff) & 0xFFF
+    )
+    return _HYBRID_CONTROL.pack(command)
 
-    def degrees_to_int(degrees: float) -> int:
-        return max(0, min(65536, int(((math.radians(degrees) + 12.5) / 25.0) * 65536)))
 
-    def rpm_to_int(rpm: float) -> int:
-        return max(0, min(4095, int(((rpm + 18.0) / 36.0) * 4095)))
+_HEX = tuple(hex(i) for i in range(256))
 
-    def torque_to_int(torque: float) -> int:
-        return max(0, min(4095, int(((torque + 150) / 300) * 4095)))
 
-    command = 0
-    command = push_bits(command, 0, 3)
-    command = push_bits(command, int(kp * 4095 / 500), 12)
-    command = push_bits(command, int(kd * 511 / 5), 9)
-    command = push_bits(command, int(degrees_to_int(position)), 16)
-    command = push_bits(command, int(rpm_to_int(speed)), 12)
-    command = push_bits(command, int(torque_to_int(torque_ff)), 12)
-    return split_into_bytes(command)
+def debug(command: bytes) -> List[str]:
+    return [_HEX[i] for i in command]
 
 
-def debug(command: bytes) -> List[str]:
-    return [hex(i) for i in command]
+# Compiled fast path, see _bionic_fast.pyx
+try:
+    from _bionic_fast import set_position_control  # noqa: F811
+except ImportError:
+    pass
 
 
 if __name__ == "__main__":
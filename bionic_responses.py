@@ -10,6 +10,7 @@ ERROR_MAP = {
     2: "Motor Overcurrent",
     3: "Motor Voltage too low",
     4: "Motor Encoder Error",
+    5: "Reserved",
     6: "Motor brake voltage too high",
     7: "DRV Driver Error",
 }
@@ -27,13 +28,59 @@ CONFIG_MAP = {
 
 CONFIG_STATUS_MAP = {0: "Failure", 1: "Success"}
 
+# Message layouts
+
+# 3-bit type | 5-bit error | uint16 position | 12-bit speed | 12-bit current | uint8 temperature | uint8 MOS temperature
+_POSITION_SPEED_MESSAGE = struct.Struct("!Q")
+# 3-bit type | 5-bit error | fp32 position | uint16 current | uint8 temperature
+_POSITION_MESSAGE = struct.Struct("!BfHB")
+# 3-bit type | 5-bit error | fp32 speed | uint16 current | uint8 temperature
+_SPEED_MESSAGE = struct.Struct("!BfHB")
+# 3-bit type | 5-bit error | uint8 query code | fp32 data
+_CUSTOM_MESSAGE = struct.Struct("!BBf")
+
+
+def _position_speed_fields(msg: bytes) -> tuple:
+    if len(msg) < 8:
+        raise IndexError("index out of range")
+    word = _POSITION_SPEED_MESSAGE.unpack_from(msg)[0]
+    return (
+        (word >> 56) & 0x1F,
+        (word >> 40) & 0xFFFF,
+        (word >> 28) & 0xFFF,
+        (word >> 16) & 0xFFF,
+        (word >> 8) & 0xFF,
+        word & 0xFF,
+    )
+
+
+# Field scaling
+
+
+def _uint16_to_position(data: int) -> float:
+    return data * (25.0 / 65536.0) - 12.5
+
+
+def _uint12_to_speed(data: int) -> float:
+    return data * (36.0 / 4095.0) - 18.0
+
+
+def _uint12_to_current(data: int) -> float:
+    return data * (140.0 / 4095) - 70.0
+
+
+def _deciamps_to_current(data: int) -> float:
+    return data / 10.0
+
+
+def _raw_to_temp(data: int) -> float:
+    return (data - 50.0) / 2.0
+
 
 def get_message_type(msg: bytes) -> int:
     """Returns the message type of the message."""
-    for i in range(1, 6):
-        if msg[0] >> 5 == i:
-            return i
-    return -1
+    message_type = msg[0] >> 5
+    return message_type if 1 <= message_type <= 5 else -1
 
 
 def position_speed_message(msg: bytes) -> dict:
@@ -47,37 +94,18 @@ def position_speed_message(msg: bytes) -> dict:
     Returns:
         dictionary of the message results
     """
-
-    def get_position(data: int) -> float:
-        return data * (25.0 / 65536.0) - 12.5
-
-    def get_speed(data: int) -> float:
-        return data * (36.0 / 4095.0) - 18.0
-
-    def get_current(data: int) -> float:
-        return data * (140.0 / 4095) - 70.0
-
-    def get_temp(data: int) -> float:
-        return (data - 50.0) / 2.0
-
-    def get_mos_temp(data: int) -> float:
-        return (data - 50.0) / 2.0
-
-    error = msg[0] & 0x1F
-    motor_pos = int.from_bytes(msg[1:3], "big")
-    motor_speed = int.from_bytes(msg[3:5], "big") >> 4
-    motor_current = int.from_bytes(msg[4:6], "big") & 0xFFF
-    motor_temp = ((msg[6]) - 50) / 2
-    motor_mos_temp = ((msg[7]) - 50) / 2
+    error, motor_pos, motor_speed, motor_current, motor_temp, motor_mos_temp = _position_speed_fields(msg)
+    motor_temp = (motor_temp - 50) / 2
+    motor_mos_temp = (motor_mos_temp - 50) / 2
 
     return {
         "Message Type": 1,
         "Error": ERROR_MAP[error],
-        "Position": get_position(motor_pos),
-        "Speed": get_speed(motor_speed),
-        "Current": get_current(motor_current),
-        "Temperature": get_temp(motor_temp),
-        "MOS": get_mos_temp(motor_mos_temp),
+        "Position": _uint16_to_position(motor_pos),
+        "Speed": _uint12_to_speed(motor_speed),
+        "Current": _uint12_to_current(motor_current),
+        "Temperature": _raw_to_temp(motor_temp),
+        "MOS": _raw_to_temp(motor_mos_temp),
     }
 
 
@@ -93,27 +121,18 @@ def position_message(msg: bytes) -> dict:
         dictionary of the message results
 
     """
-
-    def get_position(data: int) -> float:
-        return data
-
-    def get_current(data: int) -> float:
-        return data / 10.0
-
-    def get_temp(data: int) -> float:
-        return (data - 50.0) / 2.0
-
-    error = msg[0] & 0x1F
-    motor_pos = struct.unpack("!f", msg[1:5])[0]
-    motor_current = int.from_bytes(msg[5:7])
-    motor_temp = msg[7]
+    # Truncated frames fail as before: struct.error without the float, IndexError without the temperature
+    if 5 <= len(msg) < 8:
+        raise IndexError("index out of range")
+    header, motor_pos, motor_current, motor_temp = _POSITION_MESSAGE.unpack_from(msg)
+    error = header & 0x1F
 
     return {
         "Message Type": 2,
         "Error": ERROR_MAP[error],
-        "Position": get_position(motor_pos),
-        "Current": get_current(motor_current),
-        "Temperature": get_temp(motor_temp),
+        "Position": motor_pos,
+        "Current": _deciamps_to_current(motor_current),
+        "Temperature": _raw_to_temp(motor_temp),
     }
 
 
@@ -128,27 +147,18 @@ def speed_message(msg: bytes) -> dict:
     Returns:
         dictionary of the message results
     """
-
-    def get_speed(data: int) -> float:
-        return data
-
-    def get_current(data: int) -> float:
-        return data / 10.0
-
-    def get_temp(data: int) -> float:
-        return (data - 50.0) / 2.0
-
-    error = msg[0] & 0x1F
-    motor_speed = struct.unpack("!f", msg[1:5])[0]
-    motor_current = int.from_bytes(msg[5:7])
-    motor_temp = msg[7]
+    # Truncated frames fail as before: struct.error without the float, IndexError without the temperature
+    if 5 <= len(msg) < 8:
+        raise IndexError("index out of range")
+    header, motor_speed, motor_current, motor_temp = _SPEED_MESSAGE.unpack_from(msg)
+    error = header & 0x1F
 
     return {
         "Message Type": 3,
         "Error": ERROR_MAP[error],
-        "Speed": get_speed(motor_speed),
-        "Current": get_current(motor_current),
-        "Temperature": get_temp(motor_temp),
+        "Speed": motor_speed,
+        "Current": _deciamps_to_current(motor_current),
+        "Temperature": _raw_to_temp(motor_temp),
     }
 
 
@@ -187,10 +197,13 @@ def custom_message(msg: bytes) -> dict:
         dictionary of the message results
 
     """
-    error = msg[0] & 0x1F
-    query_code = msg[1]
-    data = bytes(msg[2:])
-    data = struct.unpack("!f", data)[0]
+    # Frames other than 6 bytes fail as before: IndexError without the query code, struct.error otherwise
+    if len(msg) != 6:
+        if len(msg) < 2:
+            raise IndexError("index out of range")
+        raise struct.error("unpack requires a buffer of 4 bytes")
+    header, query_code, data = _CUSTOM_MESSAGE.unpack_from(msg)
+    error = header & 0x1F
 
     return {"Message Type": 5, "Error": ERROR_MAP[error], "Query Code": QUERY_MAP[query_code], "Data": data}
 
@@ -203,6 +216,9 @@ MESSAGE_MAP = {
     5: custom_message,
 }
 
+# Parsers indexed by the 3-bit message type, None for unused types.
+_DISPATCH = tuple(MESSAGE_MAP.get(message_type) for message_type in range(8))
+
 
 def valid_message(msg: bytes) -> bool:
     """Checks if the message is valid by checking the message type.
@@ -227,12 +243,17 @@ def read_result(msg: bytes) -> dict:
         dictionary of the message results
 
     """
-    message_type = get_message_type(msg)
-    if valid_message(msg):
-        return MESSAGE_MAP[message_type](msg)
-    return None
+    parser = _DISPATCH[msg[0] >> 5 & 0x7]
+    return parser(msg) if parser is not None else None
+
+
+# Compiled fast path, see _bionic_fast.pyx
+try:
+    from _bionic_fast import position_speed_fields as _position_speed_fields  # noqa: F811
+except ImportError:
+    pass
 
 
 if __name__ == "__main__":
-    vector = [0xA0, 0x01, 0x39, 0xF7, 0x24, 0x7D]
+    vector = bytes([0xA0, 0x01, 0x39, 0xF7, 0x24, 0x7D])
     print(read_result(vector))